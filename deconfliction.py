@@ -1,8 +1,10 @@
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from math import sqrt
 from typing import List, Dict, Optional
-from dataclasses import asdict
 
 from models import Waypoint, Mission, Conflict
+from kernels import scan_flights, interp_xyz
 
 
 class DroneDeconflictionSystem:
@@ -10,181 +12,305 @@ class DroneDeconflictionSystem:
     
     def __init__(self, safety_buffer: float = 10.0):
         self.safety_buffer = safety_buffer
+        # Squared buffer cached once so the hot path never takes a sqrt
+        # (or re-squares) per sample
+        self._buffer_sq = np.float32(safety_buffer) ** 2
         self.primary_mission = None
         self.simulated_flights = []
         self.conflicts = []
+        self._window_index = None  # Sorted start/end index over sim flights
+        self._time_step = 0.1  # Sampling resolution for conflict checks (seconds)
+        self._sample_times = None  # Cached grid over the primary's window
+        self._conflicts_xyz_cache = None  # Conflict locations as an (N, 3) array
         
     def add_primary_mission(self, mission: Mission):
         """Add the primary drone mission"""
         self.primary_mission = mission
         self._calculate_waypoint_times(mission)
+
+        # Build the sampling grid once; check_conflicts and the animations
+        # all read this instead of rebuilding it per call. linspace pins
+        # both endpoints so the mission end time is always sampled
+        num_samples = int(round((mission.end_time - mission.start_time) / self._time_step)) + 1
+        self._sample_times = np.linspace(mission.start_time, mission.end_time,
+                                         num_samples, dtype=np.float32)
         
     def add_simulated_flight(self, mission: Mission):
         """Add a simulated drone flight"""
         self._calculate_waypoint_times(mission)
         self.simulated_flights.append(mission)
+        self._window_index = None
         
     def _calculate_waypoint_times(self, mission: Mission):
         """Calculate timing for waypoints if not provided"""
         if not mission.waypoints:
             return
-            
-        # Calculate total distance of mission
-        total_distance = 0
-        distances = [0]  # Distance to each waypoint from start
-        
-        for i in range(1, len(mission.waypoints)):
-            w1, w2 = mission.waypoints[i-1], mission.waypoints[i]
-            dist = np.sqrt((w2.x - w1.x)**2 + (w2.y - w1.y)**2 + (w2.z - w1.z)**2)
-            total_distance += dist
-            distances.append(total_distance)
-        
+
+        # Cumulative distance to each waypoint from start
+        segments = np.diff(mission._xyz, axis=0)
+        distances = np.concatenate([[0.0], np.cumsum(np.sqrt((segments ** 2).sum(axis=1)))])
+        total_distance = distances[-1]
+
         # Calculate time for each waypoint based on proportional distance
         mission_duration = mission.end_time - mission.start_time
-        
+
         for i, waypoint in enumerate(mission.waypoints):
             if waypoint.time is None:
                 if total_distance > 0:
                     waypoint.time = mission.start_time + (distances[i] / total_distance) * mission_duration
                 else:
                     waypoint.time = mission.start_time
+
+        # Cache the timing array alongside the coordinate array
+        mission._ts = np.array([w.time for w in mission.waypoints], dtype=np.float32)
+
+        # Per-segment velocity vectors, shared by single-time interpolation
+        # and the closest-approach solver so neither re-derives them
+        dt = np.diff(mission._ts)
+        dt_safe = np.where(dt > 0, dt, 1.0).astype(np.float32)
+        mission._v = np.diff(mission._xyz, axis=0) / dt_safe[:, None]
+        mission._v[dt == 0] = 0.0
     
     def _interpolate_position(self, mission: Mission, time: float) -> Optional[Waypoint]:
         """Interpolate drone position at a given time"""
-        waypoints = mission.waypoints
-        
+        if not mission.waypoints:
+            return None
+
         if time < mission.start_time or time > mission.end_time:
             return None
-            
-        # Find the two waypoints to interpolate between
-        for i in range(len(waypoints) - 1):
-            w1, w2 = waypoints[i], waypoints[i + 1]
-            if w1.time <= time <= w2.time:
-                if w2.time == w1.time:
-                    t = 0
-                else:
-                    t = (time - w1.time) / (w2.time - w1.time)
-                
-                return Waypoint(
-                    x=w1.x + t * (w2.x - w1.x),
-                    y=w1.y + t * (w2.y - w1.y),
-                    z=w1.z + t * (w2.z - w1.z),
-                    time=time
-                )
-        
-        # If time is at the last waypoint or beyond
-        return waypoints[-1] if waypoints else None
+
+        if len(mission.waypoints) < 2:
+            return mission.waypoints[-1]
+
+        pos = interp_xyz(time, mission._ts, mission._xyz, mission._v)
+        return Waypoint(x=float(pos[0]), y=float(pos[1]), z=float(pos[2]), time=time)
     
+    def _flights_in_window(self, start: float, end: float) -> List[Mission]:
+        """Select simulated flights whose time window intersects [start, end]
+
+        Keeps a start-time-sorted index over the flights so the lookup is a
+        binary search plus a vectorized end-time filter, rather than a
+        Python scan over every flight.
+        """
+        if not self.simulated_flights:
+            return []
+
+        if self._window_index is None:
+            starts = np.array([s.start_time for s in self.simulated_flights])
+            ends = np.array([s.end_time for s in self.simulated_flights])
+            order = np.argsort(starts, kind='stable')
+            self._window_index = (starts[order], ends[order], order)
+
+        sorted_starts, sorted_ends, order = self._window_index
+
+        # Flights starting after `end` cannot overlap; of the rest, keep
+        # those that have not already ended before `start`
+        hi = np.searchsorted(sorted_starts, end, side='right')
+        active = order[:hi][sorted_ends[:hi] >= start]
+        return [self.simulated_flights[i] for i in active]
+
+    def _aabbs_overlap(self, a: Mission, b: Mission) -> bool:
+        """Check whether two missions' bounding boxes come within the safety buffer"""
+        if a._aabb is None or b._aabb is None:
+            return False
+        a_min, a_max = a._aabb
+        b_min, b_max = b._aabb
+        return bool(np.all(a_min - self.safety_buffer <= b_max) and
+                    np.all(b_min - self.safety_buffer <= a_max))
+
+    def _closest_approach(self, a: Mission, b: Mission, t_lo: float, t_hi: float):
+        """Exact minimum separation between two missions within [t_lo, t_hi]
+
+        Both trajectories are piecewise linear in time, so on each pair of
+        overlapping waypoint segments the squared separation is a quadratic
+        in t whose minimum has a closed form. Returns (time, distance) of
+        the closest approach, or (None, None) if the windows never overlap.
+        """
+        t_lo = max(t_lo, a.start_time, b.start_time)
+        t_hi = min(t_hi, a.end_time, b.end_time)
+
+        if t_lo > t_hi or len(a.waypoints) < 2 or len(b.waypoints) < 2:
+            return None, None
+
+        best_time = None
+        best_dist_sq = np.inf
+
+        for i in range(len(a._ts) - 1):
+            a0, a1 = a._ts[i], a._ts[i + 1]
+            if a1 <= t_lo or a0 >= t_hi or a1 == a0:
+                continue
+
+            for j in range(len(b._ts) - 1):
+                b0, b1 = b._ts[j], b._ts[j + 1]
+                if b1 == b0:
+                    continue
+
+                lo = max(a0, b0, t_lo)
+                hi = min(a1, b1, t_hi)
+                if lo >= hi:
+                    continue
+
+                # Relative position over the overlap: r(t) = r0 + v * (t - lo)
+                pos_a = a._xyz[i] + a._v[i] * (lo - a0)
+                pos_b = b._xyz[j] + b._v[j] * (lo - b0)
+
+                r0 = pos_a - pos_b
+                v = a._v[i] - b._v[j]
+                v_sq = v @ v
+
+                # Quadratic |r0 + v*dt|^2 is minimized at dt = -r0.v / v.v,
+                # clipped to the overlap window
+                if v_sq > 0:
+                    t_star = min(max(lo - (r0 @ v) / v_sq, lo), hi)
+                else:
+                    t_star = lo
+
+                r = r0 + v * (t_star - lo)
+                dist_sq = r @ r
+
+                if dist_sq < best_dist_sq:
+                    best_dist_sq = dist_sq
+                    best_time = t_star
+
+        if best_time is None:
+            return None, None
+        return best_time, sqrt(best_dist_sq)
+
+    def _interpolate_trajectory(self, mission: Mission, times: np.ndarray) -> np.ndarray:
+        """Interpolate a mission's position at every sample time, vectorized"""
+        # Waypoint-less missions never get a timing array; an all-NaN
+        # trajectory keeps every distance comparison False and every drone
+        # marker hidden, matching the old per-sample None result
+        if mission._ts is None:
+            return np.full((len(times), 3), np.nan, dtype=np.float32)
+
+        px = np.interp(times, mission._ts, mission._xyz[:, 0])
+        py = np.interp(times, mission._ts, mission._xyz[:, 1])
+        pz = np.interp(times, mission._ts, mission._xyz[:, 2])
+        return np.stack([px, py, pz], axis=1).astype(np.float32)
+
+    def _conflicts_xyz(self) -> np.ndarray:
+        """Conflict locations as an (N, 3) array, cached between plot calls"""
+        if (self._conflicts_xyz_cache is None or
+                len(self._conflicts_xyz_cache) != len(self.conflicts)):
+            self._conflicts_xyz_cache = np.array(
+                [[c.location.x, c.location.y, c.location.z] for c in self.conflicts],
+                dtype=np.float32).reshape(-1, 3)
+        return self._conflicts_xyz_cache
+
     def check_conflicts(self) -> Dict:
         """Check for conflicts between primary mission and simulated flights"""
         self.conflicts = []
-        
+        self._conflicts_xyz_cache = None
+
         if not self.primary_mission or not self.simulated_flights:
             return {"status": "clear", "conflicts": [], "details": "No flights to check"}
-        
-        # Time resolution for checking (every 0.1 seconds)
-        time_step = 0.1
+
+        time_step = self._time_step
         start_time = self.primary_mission.start_time
         end_time = self.primary_mission.end_time
-        
-        # Check conflicts at each time step
-        current_time = start_time
-        while current_time <= end_time:
-            primary_pos = self._interpolate_position(self.primary_mission, current_time)
-            
-            if primary_pos is None:
-                current_time += time_step
-                continue
-            
-            # Check against all simulated flights
-            for sim_flight in self.simulated_flights:
-                sim_pos = self._interpolate_position(sim_flight, current_time)
-                
-                if sim_pos is None:
+
+        # Sample the whole mission window at once and interpolate the
+        # primary trajectory as a (T, 3) array
+        times = self._sample_times
+        primary_traj = self._interpolate_trajectory(self.primary_mission, times)
+
+        # Cheap rejection: skip flights whose time window or bounding box
+        # (inflated by the safety buffer) cannot intersect the primary's
+        candidates = [s for s in self._flights_in_window(start_time, end_time)
+                      if self._aabbs_overlap(self.primary_mission, s)]
+
+        if candidates:
+            # Stage every candidate's trajectory and active-time mask so the
+            # kernel can scan all flights in parallel, one core per flight.
+            # np.interp releases the GIL, so with enough flights the per-
+            # flight interpolations genuinely overlap across threads; for
+            # one or two the pool costs more than it saves
+            if len(candidates) > 2:
+                with ThreadPoolExecutor(max_workers=min(8, len(candidates))) as pool:
+                    trajectories = list(pool.map(
+                        lambda f: self._interpolate_trajectory(f, times), candidates))
+            else:
+                trajectories = [self._interpolate_trajectory(f, times) for f in candidates]
+            sim_all = np.stack(trajectories)
+            inactive_all = np.stack([(times < f.start_time) | (times > f.end_time)
+                                     for f in candidates])
+
+            out_counts = np.empty(len(candidates), dtype=np.int64)
+            out_idx = np.empty((len(candidates), len(times)), dtype=np.int64)
+            out_dist_sq = np.empty((len(candidates), len(times)), dtype=np.float32)
+
+            scan_flights(primary_traj, sim_all, inactive_all, self._buffer_sq,
+                         out_counts, out_idx, out_dist_sq)
+
+            # Stream each contiguous run of breaching samples into a single
+            # Conflict instead of materializing one object per tick: a
+            # prolonged near-miss becomes one zone, which subsumes the old
+            # pairwise consolidation pass
+            for f, sim_flight in enumerate(candidates):
+                count = out_counts[f]
+                if count == 0:
                     continue
-                
-                # Calculate distance
-                distance = np.sqrt(
-                    (primary_pos.x - sim_pos.x)**2 + 
-                    (primary_pos.y - sim_pos.y)**2 + 
-                    (primary_pos.z - sim_pos.z)**2
-                )
-                
-                # Check if within safety buffer
-                if distance < self.safety_buffer:
-                    conflict = Conflict(
-                        location=Waypoint(
-                            x=(primary_pos.x + sim_pos.x) / 2,
-                            y=(primary_pos.y + sim_pos.y) / 2,
-                            z=(primary_pos.z + sim_pos.z) / 2
-                        ),
-                        time=current_time,
-                        primary_drone=self.primary_mission.drone_id,
-                        conflicting_drone=sim_flight.drone_id,
-                        distance=distance,
-                        description=f"Conflict at time {current_time:.1f}s: distance {distance:.2f} < safety buffer {self.safety_buffer}"
-                    )
-                    self.conflicts.append(conflict)
-            
-            current_time += time_step
-        
-        # Consolidate nearby conflicts (within 1 second and 5 units)
-        consolidated_conflicts = self._consolidate_conflicts()
-        
-        status = "conflict detected" if consolidated_conflicts else "clear"
-        
+
+                hit_idx = out_idx[f, :count]
+                run_bounds = np.nonzero(np.diff(hit_idx) > 1)[0] + 1
+
+                for run in np.split(np.arange(count), run_bounds):
+                    indices = hit_idx[run]
+                    run_dist_sq = out_dist_sq[f, run]
+                    self.conflicts.append(self._make_zone_conflict(
+                        sim_flight, times, time_step, primary_traj, sim_all[f],
+                        indices, run_dist_sq))
+
+        status = "conflict detected" if self.conflicts else "clear"
+
         return {
             "status": status,
-            "conflicts": [asdict(c) for c in consolidated_conflicts],
-            "details": f"Found {len(consolidated_conflicts)} conflict zones" if consolidated_conflicts else "No conflicts detected"
+            "conflicts": [c.to_dict() for c in self.conflicts],
+            "details": f"Found {len(self.conflicts)} conflict zones" if self.conflicts else "No conflicts detected"
         }
-    
-    def _consolidate_conflicts(self) -> List[Conflict]:
-        """Consolidate nearby conflicts to avoid spam"""
-        if not self.conflicts:
-            return []
-        
-        consolidated = []
-        used = set()
-        
-        for i, conflict in enumerate(self.conflicts):
-            if i in used:
-                continue
-                
-            similar_conflicts = [conflict]
-            used.add(i)
-            
-            # Find similar conflicts
-            for j, other_conflict in enumerate(self.conflicts[i+1:], i+1):
-                if j in used:
-                    continue
-                
-                time_diff = abs(conflict.time - other_conflict.time)
-                spatial_diff = np.sqrt(
-                    (conflict.location.x - other_conflict.location.x)**2 +
-                    (conflict.location.y - other_conflict.location.y)**2 +
-                    (conflict.location.z - other_conflict.location.z)**2
+
+    def _make_zone_conflict(self, sim_flight: Mission, times: np.ndarray,
+                            time_step: float, primary_traj: np.ndarray,
+                            sim_traj: np.ndarray, indices: np.ndarray,
+                            run_dist_sq: np.ndarray) -> Conflict:
+        """Build one Conflict for a contiguous run of breaching samples
+
+        The sampled run gives the zone; the analytic closest-approach
+        solver then pins the exact time and minimum separation, since the
+        sampled minimum is aliased to the grid.
+        """
+        k = int(run_dist_sq.argmin())
+        idx_min = indices[k]
+        zone_time = float(times[idx_min])
+        zone_dist = sqrt(run_dist_sq[k])
+        midpoint = (primary_traj[idx_min] + sim_traj[idx_min]) / 2
+        location = Waypoint(x=float(midpoint[0]), y=float(midpoint[1]), z=float(midpoint[2]))
+
+        # Exact refinement over the run's window, padded by one step so a
+        # minimum falling between samples is still captured
+        t_lo = float(times[indices[0]]) - time_step
+        t_hi = float(times[indices[-1]]) + time_step
+        exact_time, exact_dist = self._closest_approach(
+            self.primary_mission, sim_flight, t_lo, t_hi)
+
+        if exact_time is not None and exact_dist < self.safety_buffer:
+            primary_pos = self._interpolate_position(self.primary_mission, float(exact_time))
+            sim_pos = self._interpolate_position(sim_flight, float(exact_time))
+            if primary_pos is not None and sim_pos is not None:
+                zone_time = float(exact_time)
+                zone_dist = float(exact_dist)
+                location = Waypoint(
+                    x=(primary_pos.x + sim_pos.x) / 2,
+                    y=(primary_pos.y + sim_pos.y) / 2,
+                    z=(primary_pos.z + sim_pos.z) / 2
                 )
-                
-                if time_diff <= 1.0 and spatial_diff <= 5.0:
-                    similar_conflicts.append(other_conflict)
-                    used.add(j)
-            
-            # Create consolidated conflict
-            avg_time = np.mean([c.time for c in similar_conflicts])
-            avg_x = np.mean([c.location.x for c in similar_conflicts])
-            avg_y = np.mean([c.location.y for c in similar_conflicts])
-            avg_z = np.mean([c.location.z for c in similar_conflicts])
-            min_distance = min([c.distance for c in similar_conflicts])
-            
-            consolidated_conflict = Conflict(
-                location=Waypoint(x=avg_x, y=avg_y, z=avg_z),
-                time=avg_time,
-                primary_drone=conflict.primary_drone,
-                conflicting_drone=conflict.conflicting_drone,
-                distance=min_distance,
-                description=f"Conflict zone at time {avg_time:.1f}s: minimum separation {min_distance:.2f} units"
-            )
-            consolidated.append(consolidated_conflict)
-        
-        return consolidated
\ No newline at end of file
+
+        return Conflict(
+            location=location,
+            time=zone_time,
+            primary_drone=self.primary_mission.drone_id,
+            conflicting_drone=sim_flight.drone_id,
+            distance=zone_dist,
+            description=f"Conflict zone at time {zone_time:.1f}s: minimum separation {zone_dist:.2f} units"
+        )
@@ -0,0 +1,89 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _find_conflicts_numpy(primary, sim, inactive, buffer_sq, out_idx, out_dist_sq):
+    """NumPy scan of one flight with the same contract as the jitted kernel"""
+    dist_sq = ((primary - sim) ** 2).sum(axis=1)
+    hits = np.nonzero((dist_sq < buffer_sq) & ~inactive)[0]
+    count = len(hits)
+    out_idx[:count] = hits
+    out_dist_sq[:count] = dist_sq[hits]
+    return count
+
+
+def _interp_xyz(t, wp_t, wp_xyz, wp_v):
+    """Position along a waypoint path at time t, via the cached velocities
+
+    Binary-searches the bracketing segment and advances along its velocity
+    vector, clamped to the segment, so times at or past the last waypoint
+    resolve to the final position. Expects at least two waypoints.
+    """
+    i = np.searchsorted(wp_t, t) - 1
+    if i < 0:
+        i = 0
+    if i > wp_t.shape[0] - 2:
+        i = wp_t.shape[0] - 2
+
+    dt = t - wp_t[i]
+    if dt < 0.0:
+        dt = 0.0
+    seg = wp_t[i + 1] - wp_t[i]
+    if dt > seg:
+        dt = seg
+
+    return wp_xyz[i] + wp_v[i] * dt
+
+
+def _scan_flights_numpy(primary, sim_all, inactive_all, buffer_sq,
+                        out_counts, out_idx, out_dist_sq):
+    """NumPy fallback scanning each flight serially"""
+    for f in range(sim_all.shape[0]):
+        out_counts[f] = _find_conflicts_numpy(primary, sim_all[f], inactive_all[f],
+                                              buffer_sq, out_idx[f], out_dist_sq[f])
+
+
+if NUMBA_AVAILABLE:
+    # The explicit signature makes numba compile eagerly at import instead
+    # of on first call, and cache=True persists the compiled kernel to disk
+    # so later processes skip the JIT warm-up entirely
+    @njit('void(float32[:, ::1], float32[:, :, ::1], boolean[:, ::1], float32, '
+          'int64[::1], int64[:, ::1], float32[:, ::1])',
+          parallel=True, fastmath=True, cache=True)
+    def scan_flights(primary, sim_all, inactive_all, buffer_sq,
+                     out_counts, out_idx, out_dist_sq):
+        """Fused distance/threshold scan of every flight against the primary.
+
+        Each flight's scan is independent, so the outer loop runs across
+        CPU cores via prange; every thread writes only its own flight's
+        slice of the out arrays, so there is no shared mutable state. The
+        subtraction, square, sum and compare fuse into one inner loop with
+        no temporary arrays; sqrt is deferred to the caller for the rare
+        hits.
+        """
+        for f in prange(sim_all.shape[0]):
+            count = 0
+            for i in range(primary.shape[0]):
+                if inactive_all[f, i]:
+                    continue
+                dx = primary[i, 0] - sim_all[f, i, 0]
+                dy = primary[i, 1] - sim_all[f, i, 1]
+                dz = primary[i, 2] - sim_all[f, i, 2]
+                dist_sq = dx * dx + dy * dy + dz * dz
+                if dist_sq < buffer_sq:
+                    out_idx[f, count] = i
+                    out_dist_sq[f, count] = dist_sq
+                    count += 1
+            out_counts[f] = count
+
+    # The pure-Python body above is also valid numba; jit it as-is so
+    # per-frame single-time queries skip the CPython bytecode loop
+    interp_xyz = njit(cache=True)(_interp_xyz)
+else:
+    scan_flights = _scan_flights_numpy
+    interp_xyz = _interp_xyz
@@ -1,8 +1,9 @@
-from dataclasses import dataclass
-from typing import List, Optional
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class Waypoint:
     """Represents a waypoint with coordinates and optional timing"""
     x: float
@@ -11,16 +12,34 @@ class Waypoint:
     time: Optional[float] = None  # Time to reach this waypoint
 
 
-@dataclass
+@dataclass(slots=True)
 class Mission:
     """Represents a drone mission with waypoints and time window"""
     waypoints: List[Waypoint]
     start_time: float
     end_time: float
     drone_id: str = "primary"
+    _xyz: np.ndarray = field(init=False, repr=False)
+    _ts: Optional[np.ndarray] = field(init=False, repr=False, default=None)
+    _v: Optional[np.ndarray] = field(init=False, repr=False, default=None)
+    _aabb: Optional[Tuple[np.ndarray, np.ndarray]] = field(init=False, repr=False, default=None)
 
+    def __post_init__(self):
+        # Structure-of-arrays mirror of the waypoints so vectorized
+        # consumers can slice contiguous coordinates instead of walking
+        # the Waypoint objects
+        # float32 halves memory traffic and doubles SIMD width; meter-scale
+        # coordinates fit comfortably within its precision
+        self._xyz = np.array([[w.x, w.y, w.z] for w in self.waypoints],
+                             dtype=np.float32).reshape(-1, 3)
+        self._ts = None  # Filled once waypoint times are calculated
 
-@dataclass
+        # Axis-aligned bounding box for cheap spatial rejection
+        if len(self.waypoints) > 0:
+            self._aabb = (self._xyz.min(axis=0), self._xyz.max(axis=0))
+
+
+@dataclass(slots=True)
 class Conflict:
     """Represents a detected conflict between drones"""
     location: Waypoint
@@ -28,4 +47,24 @@ class Conflict:
     primary_drone: str
     conflicting_drone: str
     distance: float
-    description: str
\ No newline at end of file
+    description: str
+
+    def to_dict(self):
+        """Plain-dict form of the conflict for reports
+
+        Equivalent to dataclasses.asdict but without its recursive
+        deepcopy machinery.
+        """
+        return {
+            "location": {
+                "x": self.location.x,
+                "y": self.location.y,
+                "z": self.location.z,
+                "time": self.location.time,
+            },
+            "time": self.time,
+            "primary_drone": self.primary_drone,
+            "conflicting_drone": self.conflicting_drone,
+            "distance": self.distance,
+            "description": self.description,
+        }
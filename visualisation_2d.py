@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from matplotlib.colors import to_rgba
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -13,7 +14,18 @@ class Visualizer2D:
     def __init__(self, system: 'DroneDeconflictionSystem'):
         self.system = system
         self.colors = ['r', 'g', 'm', 'orange', 'brown']
-    
+        # Parsed once so plot/scatter calls reuse ready-made RGBA values
+        # and style strings instead of re-deriving them per flight
+        self._rgba = np.stack([to_rgba(c) for c in self.colors])
+        self._line_styles = [f'{c}-s' for c in self.colors]
+        # Blitting state for refresh_conflicts: the static figure, its
+        # cached conflict-free background, and the persistent overlay artists
+        self._fig = None
+        self._ax = None
+        self._background = None
+        self._conflict_scatter = None
+        self._buffer_circles = []
+
     def plot_static(self):
         """Create static 2D visualization of missions and conflicts"""
         fig, ax = plt.subplots(figsize=(12, 8))
@@ -24,40 +36,70 @@ class Visualizer2D:
             return
         
         # Plot primary mission waypoints
-        primary_x = [w.x for w in self.system.primary_mission.waypoints]
-        primary_y = [w.y for w in self.system.primary_mission.waypoints]
-        ax.plot(primary_x, primary_y, 'b-o', linewidth=2, markersize=8, label='Primary Mission')
-        
+        primary_xyz = self.system.primary_mission._xyz
+        ax.plot(primary_xyz[:, 0], primary_xyz[:, 1], 'b-o', linewidth=2, markersize=8, label='Primary Mission')
+
         # Plot simulated flights
         for i, flight in enumerate(self.system.simulated_flights):
-            flight_x = [w.x for w in flight.waypoints]
-            flight_y = [w.y for w in flight.waypoints]
-            color = self.colors[i % len(self.colors)]
-            ax.plot(flight_x, flight_y, f'{color}-s', linewidth=2, markersize=6, 
+            flight_xyz = flight._xyz
+            style = self._line_styles[i % len(self._line_styles)]
+            ax.plot(flight_xyz[:, 0], flight_xyz[:, 1], style, linewidth=2, markersize=6,
                    label=f'Simulated Flight {flight.drone_id}')
         
-        # Plot conflicts
-        if self.system.conflicts:
-            conflict_x = [c.location.x for c in self.system.conflicts]
-            conflict_y = [c.location.y for c in self.system.conflicts]
-            ax.scatter(conflict_x, conflict_y, c='red', s=200, marker='x', linewidth=3, 
-                      label='Conflicts', zorder=10)
-            
-            # Add safety buffer circles around conflicts
-            for conflict in self.system.conflicts:
-                circle = plt.Circle((conflict.location.x, conflict.location.y), 
-                                  self.system.safety_buffer, fill=False, color='red', 
-                                  linestyle='--', alpha=0.5)
-                ax.add_patch(circle)
-        
+        # The conflict overlay lives in one persistent scatter (plus buffer
+        # circles added in refresh_conflicts), created empty here so the
+        # background can be cached without it
+        self._conflict_scatter = ax.scatter(
+            np.empty(0), np.empty(0), c='red', s=200, marker='x', linewidth=3,
+            label='Conflicts' if self.system.conflicts else None, zorder=10)
+        self._buffer_circles = []
+
         ax.set_xlabel('X Coordinate')
         ax.set_ylabel('Y Coordinate')
         ax.set_title('Drone Mission Deconfliction - 2D View')
         ax.legend()
         ax.grid(True, alpha=0.3)
         ax.axis('equal')
-        
+
+        # Render once with the overlay empty and cache the result; a
+        # re-check only needs the overlay blitted over this background
+        fig.canvas.draw()
+        self._fig, self._ax = fig, ax
+        self._background = fig.canvas.copy_from_bbox(ax.bbox)
+        self.refresh_conflicts()
+
         plt.show()
+
+    def refresh_conflicts(self):
+        """Repaint only the conflict overlay on the cached static figure
+
+        After a new check_conflicts run, restores the conflict-free
+        background saved by plot_static and blits the updated markers and
+        safety-buffer circles over it, instead of rebuilding the whole
+        figure. Falls back to a full plot when no figure is cached yet.
+        """
+        if self._background is None:
+            self.plot_static()
+            return
+
+        fig, ax = self._fig, self._ax
+        fig.canvas.restore_region(self._background)
+
+        self._conflict_scatter.set_offsets(self.system._conflicts_xyz()[:, :2])
+        ax.draw_artist(self._conflict_scatter)
+
+        for circle in self._buffer_circles:
+            circle.remove()
+        self._buffer_circles = []
+        for conflict in self.system.conflicts:
+            circle = plt.Circle((conflict.location.x, conflict.location.y),
+                                self.system.safety_buffer, fill=False, color='red',
+                                linestyle='--', alpha=0.5)
+            ax.add_patch(circle)
+            ax.draw_artist(circle)
+            self._buffer_circles.append(circle)
+
+        fig.canvas.blit(ax.bbox)
     
     def animate(self):
         """Create 2D animation of drone movements"""
@@ -69,72 +111,106 @@ class Visualizer2D:
             return
         
         # Plot static waypoint paths first
-        primary_x = [w.x for w in self.system.primary_mission.waypoints]
-        primary_y = [w.y for w in self.system.primary_mission.waypoints]
-        ax.plot(primary_x, primary_y, 'b-o', linewidth=2, markersize=8, label='Primary Mission', alpha=0.3)
-        
+        primary_xyz = self.system.primary_mission._xyz
+        ax.plot(primary_xyz[:, 0], primary_xyz[:, 1], 'b-o', linewidth=2, markersize=8, label='Primary Mission', alpha=0.3)
+
         # Plot simulated flight paths
         for i, flight in enumerate(self.system.simulated_flights):
-            flight_x = [w.x for w in flight.waypoints]
-            flight_y = [w.y for w in flight.waypoints]
-            color = self.colors[i % len(self.colors)]
-            ax.plot(flight_x, flight_y, f'{color}-s', linewidth=2, markersize=6, 
+            flight_xyz = flight._xyz
+            style = self._line_styles[i % len(self._line_styles)]
+            ax.plot(flight_xyz[:, 0], flight_xyz[:, 1], style, linewidth=2, markersize=6,
                    label=f'Simulated Flight {flight.drone_id}', alpha=0.3)
         
         # Plot conflicts
         if self.system.conflicts:
-            conflict_x = [c.location.x for c in self.system.conflicts]
-            conflict_y = [c.location.y for c in self.system.conflicts]
-            ax.scatter(conflict_x, conflict_y, c='red', s=200, marker='x', linewidth=3, 
-                      label='Conflicts', zorder=10)
+            conflict_xyz = self.system._conflicts_xyz()
+            ax.scatter(conflict_xyz[:, 0], conflict_xyz[:, 1], c='red', s=200, marker='x',
+                      linewidth=3, label='Conflicts', zorder=10)
         
-        # Initialize drone position markers
+        # Initialize drone position markers: one artist for the primary and
+        # a single collection holding every simulated drone, so each frame
+        # updates two artists regardless of flight count
         primary_drone, = ax.plot([], [], 'bo', markersize=12, label='Primary Drone', zorder=20)
-        sim_drones = []
-        
-        for i, flight in enumerate(self.system.simulated_flights):
-            color = self.colors[i % len(self.colors)]
-            drone, = ax.plot([], [], f'{color}s', markersize=10, 
-                           label=f'{flight.drone_id} Drone', zorder=20)
-            sim_drones.append(drone)
-        
-        # Set up axes
+
+        num_sim = len(self.system.simulated_flights)
+        sim_rgba = self._rgba[np.arange(num_sim) % len(self._rgba)]
+        sim_drones = ax.scatter(np.full(num_sim, np.nan), np.full(num_sim, np.nan),
+                                c=sim_rgba, s=100, marker='s',
+                                label='Simulated Drones', zorder=20)
+
+        # Set up axes; the title is static and only the small time readout
+        # changes per frame, so text layout work stays off the hot path
         ax.set_xlabel('X Coordinate')
         ax.set_ylabel('Y Coordinate')
+        ax.set_title('Drone Mission Deconfliction - 2D Animation')
+        time_text = ax.text(0.02, 0.95, '', transform=ax.transAxes)
         ax.legend()
         ax.grid(True, alpha=0.3)
-        ax.axis('equal')
-        
-        # Time parameters
+        # Box-adjustable so equal aspect coexists with the fixed limits set
+        # below instead of autoscaling the data limits back on
+        ax.set_aspect('equal', adjustable='box')
+        
+        # Freeze the axes before the animation starts: the legend is already
+        # built once above, and with autoscale off matplotlib stops
+        # re-running limit calculations on every draw, which blitting needs
+        # for a stable cached background anyway
+        all_xyz = np.concatenate([primary_xyz] +
+                                 [f._xyz for f in self.system.simulated_flights])
+        if len(all_xyz):
+            lo, hi = all_xyz.min(axis=0), all_xyz.max(axis=0)
+            pad = 0.05 * (hi - lo + 1.0)
+            ax.set_autoscale_on(False)
+            ax.set_xlim(lo[0] - pad[0], hi[0] + pad[0])
+            ax.set_ylim(lo[1] - pad[1], hi[1] + pad[1])
+
+        # Sample the animation at the display frame rate instead of the
+        # conflict-check resolution: with a 100ms frame interval there is
+        # no point preparing 10x more frames than will ever be drawn
+        interval = 100  # ms per frame
+        fps = 1000.0 / interval
         start_time = self.system.primary_mission.start_time
         end_time = self.system.primary_mission.end_time
-        time_step = 0.1
-        times = np.arange(start_time, end_time + time_step, time_step)
-        
+        times = np.linspace(start_time, end_time,
+                            max(2, int(round((end_time - start_time) * fps)) + 1))
+
+        # Precompute every flight's full trajectory once so each frame is
+        # just an array lookup instead of per-drone interpolation calls.
+        # Inactive drones get NaN positions, which scatter simply skips
+        primary_traj = self.system._interpolate_trajectory(self.system.primary_mission, times)
+        # float32 to match the trajectory arrays; half the memory the
+        # frame lookups walk, and already C-contiguous from np.full
+        sim_xy = np.full((num_sim, len(times), 2), np.nan, dtype=np.float32)
+        for i, flight in enumerate(self.system.simulated_flights):
+            traj = self.system._interpolate_trajectory(flight, times)
+            active = (times >= flight.start_time) & (times <= flight.end_time)
+            sim_xy[i, active] = traj[active, :2]
+
+        # Schedule only frames where at least one drone is airborne. The
+        # grid spans the primary window so its frames always qualify, but
+        # flights shorter than the window contribute nothing outside their
+        # own spans and an all-NaN lead-in or tail is skipped outright
+        active = (times >= start_time) & (times <= end_time)
+        for flight in self.system.simulated_flights:
+            active |= (times >= flight.start_time) & (times <= flight.end_time)
+        frame_indices = np.flatnonzero(active)
+
         def animate_frame(frame):
-            current_time = times[frame % len(times)]
-            
+            # frames= already yields valid indices (and FuncAnimation
+            # restarts the sequence on repeat), so index directly
+            current_time = times[frame]
+
             # Update primary drone position
-            primary_pos = self.system._interpolate_position(self.system.primary_mission, current_time)
-            if primary_pos:
-                primary_drone.set_data([primary_pos.x], [primary_pos.y])
-            else:
-                primary_drone.set_data([], [])
-            
-            # Update simulated drone positions
-            for i, (flight, drone_marker) in enumerate(zip(self.system.simulated_flights, sim_drones)):
-                sim_pos = self.system._interpolate_position(flight, current_time)
-                if sim_pos:
-                    drone_marker.set_data([sim_pos.x], [sim_pos.y])
-                else:
-                    drone_marker.set_data([], [])
-            
-            # Update title with current time
-            ax.set_title(f'Drone Mission Deconfliction - 2D Animation (t={current_time:.1f}s)')
-            
-            return [primary_drone] + sim_drones
+            primary_drone.set_data([primary_traj[frame, 0]], [primary_traj[frame, 1]])
+
+            # Update all simulated drone positions through the one collection
+            sim_drones.set_offsets(sim_xy[:, frame])
+
+            # Update the time readout
+            time_text.set_text(f't={current_time:.1f}s')
+
+            return [primary_drone, sim_drones, time_text]
         
-        anim = animation.FuncAnimation(fig, animate_frame, frames=len(times), 
-                                     interval=100, blit=True, repeat=True)
+        anim = animation.FuncAnimation(fig, animate_frame, frames=frame_indices,
+                                     interval=interval, blit=True, repeat=True)
         plt.show()
         return anim
\ No newline at end of file
@@ -1,23 +1,54 @@
 
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from mpl_toolkits.mplot3d import Axes3D
 from typing import TYPE_CHECKING
 
+# matplotlib and its 3D toolkit are imported lazily inside the methods
+# that draw: importing pyplot pulls in the whole rendering stack, and
+# callers that only run conflict checks should not pay for it
+
 if TYPE_CHECKING:
     from deconfliction import DroneDeconflictionSystem
 
+# Waypoint count above which a path is drawn as a Line3DCollection plus a
+# single marker scatter instead of a styled ax.plot call; short paths stay
+# on the plot path, which handles its few markers fine
+_DENSE_PATH_THRESHOLD = 500
+
 
 class Visualizer3D:
     """3D visualization handler for drone missions"""
-    
+
     def __init__(self, system: 'DroneDeconflictionSystem'):
+        from matplotlib.colors import to_rgba
+
         self.system = system
         self.colors = ['r', 'g', 'm', 'orange', 'brown']
-    
+        # Parsed once so plot/scatter calls reuse ready-made RGBA values
+        # and style strings instead of re-deriving them per flight
+        self._rgba = np.stack([to_rgba(c) for c in self.colors])
+        self._line_styles = [f'{c}-s' for c in self.colors]
+
+    def _plot_dense_path(self, ax, xyz, color, label, linewidth, markersize):
+        """Draw a long waypoint path as one line collection plus one scatter
+
+        Stacking consecutive waypoints into (N-1, 2, 3) segments lets the
+        whole path render as a single Line3DCollection, and the markers
+        collapse into a single scatter, instead of ax.plot materializing
+        per-marker artists for thousands of vertices.
+        """
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+        segments = np.stack([xyz[:-1], xyz[1:]], axis=1)
+        ax.add_collection3d(Line3DCollection(segments, colors=color,
+                                             linewidths=linewidth, label=label))
+        ax.scatter(xyz[:, 0], xyz[:, 1], xyz[:, 2], c=[color],
+                   s=markersize ** 2, marker='s', depthshade=False)
+
     def plot_static(self):
         """Create static 3D visualization of missions and conflicts"""
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import to_rgba
+
         fig = plt.figure(figsize=(14, 10))
         ax = fig.add_subplot(111, projection='3d')
         
@@ -26,29 +57,35 @@ class Visualizer3D:
             plt.show()
             return
         
-        # Plot primary mission waypoints
-        primary_x = [w.x for w in self.system.primary_mission.waypoints]
-        primary_y = [w.y for w in self.system.primary_mission.waypoints]
-        primary_z = [w.z for w in self.system.primary_mission.waypoints]
-        ax.plot(primary_x, primary_y, primary_z, 'b-o', linewidth=2, markersize=8, label='Primary Mission')
-        
+        # Plot primary mission waypoints from the cached SoA array
+        primary_xyz = self.system.primary_mission._xyz
+        if len(primary_xyz) > _DENSE_PATH_THRESHOLD:
+            self._plot_dense_path(ax, primary_xyz, to_rgba('blue'),
+                                  'Primary Mission', linewidth=2, markersize=8)
+        else:
+            ax.plot(primary_xyz[:, 0], primary_xyz[:, 1], primary_xyz[:, 2],
+                    'b-o', linewidth=2, markersize=8, label='Primary Mission')
+
         # Plot simulated flights
         for i, flight in enumerate(self.system.simulated_flights):
-            flight_x = [w.x for w in flight.waypoints]
-            flight_y = [w.y for w in flight.waypoints]
-            flight_z = [w.z for w in flight.waypoints]
-            color = self.colors[i % len(self.colors)]
-            ax.plot(flight_x, flight_y, flight_z, f'{color}-s', linewidth=2, markersize=6, 
-                   label=f'Simulated Flight {flight.drone_id}')
-        
+            flight_xyz = flight._xyz
+            if len(flight_xyz) > _DENSE_PATH_THRESHOLD:
+                self._plot_dense_path(ax, flight_xyz,
+                                      self._rgba[i % len(self._rgba)],
+                                      f'Simulated Flight {flight.drone_id}',
+                                      linewidth=2, markersize=6)
+            else:
+                style = self._line_styles[i % len(self._line_styles)]
+                ax.plot(flight_xyz[:, 0], flight_xyz[:, 1], flight_xyz[:, 2],
+                        style, linewidth=2, markersize=6,
+                        label=f'Simulated Flight {flight.drone_id}')
+
         # Plot conflicts
         if self.system.conflicts:
-            conflict_x = [c.location.x for c in self.system.conflicts]
-            conflict_y = [c.location.y for c in self.system.conflicts]
-            conflict_z = [c.location.z for c in self.system.conflicts]
-            ax.scatter(conflict_x, conflict_y, conflict_z, c='red', s=200, marker='x', 
-                      linewidth=3, label='Conflicts')
-        
+            conflict_xyz = self.system._conflicts_xyz()
+            ax.scatter(conflict_xyz[:, 0], conflict_xyz[:, 1], conflict_xyz[:, 2],
+                       c='red', s=200, marker='x', linewidth=3, label='Conflicts')
+
         ax.set_xlabel('X Coordinate')
         ax.set_ylabel('Y Coordinate')
         ax.set_zlabel('Z Coordinate (Altitude)')
@@ -59,80 +96,135 @@ class Visualizer3D:
     
     def animate(self):
         """Create 3D animation of drone movements"""
-        fig = plt.figure(figsize=(14, 10))
-        ax = fig.add_subplot(111, projection='3d')
-        
-        if not self.system.primary_mission:
-            ax.text(0.5, 0.5, 0.5, 'No primary mission loaded', transform=ax.transAxes)
-            plt.show()
-            return
-        
-        # Plot static waypoint paths first
-        primary_x = [w.x for w in self.system.primary_mission.waypoints]
-        primary_y = [w.y for w in self.system.primary_mission.waypoints]
-        primary_z = [w.z for w in self.system.primary_mission.waypoints]
-        ax.plot(primary_x, primary_y, primary_z, 'b-o', linewidth=2, markersize=8, 
-               label='Primary Mission', alpha=0.3)
-        
-        # Plot simulated flight paths
-        for i, flight in enumerate(self.system.simulated_flights):
-            flight_x = [w.x for w in flight.waypoints]
-            flight_y = [w.y for w in flight.waypoints]
-            flight_z = [w.z for w in flight.waypoints]
-            color = self.colors[i % len(self.colors)]
-            ax.plot(flight_x, flight_y, flight_z, f'{color}-s', linewidth=2, markersize=6, 
-                   label=f'Simulated Flight {flight.drone_id}', alpha=0.3)
-        
-        # Plot conflicts
-        if self.system.conflicts:
-            conflict_x = [c.location.x for c in self.system.conflicts]
-            conflict_y = [c.location.y for c in self.system.conflicts]
-            conflict_z = [c.location.z for c in self.system.conflicts]
-            ax.scatter(conflict_x, conflict_y, conflict_z, c='red', s=200, marker='x', 
-                      linewidth=3, label='Conflicts')
-        
-        ax.set_xlabel('X Coordinate')
-        ax.set_ylabel('Y Coordinate')
-        ax.set_zlabel('Z Coordinate (Altitude)')
-        ax.legend()
-        
-        # Time parameters
-        start_time = self.system.primary_mission.start_time
-        end_time = self.system.primary_mission.end_time
-        time_step = 0.1
-        times = np.arange(start_time, end_time + time_step, time_step)
+        import matplotlib.pyplot as plt
+        import matplotlib.animation as animation
+
+        # Path simplification collapses near-collinear vertices before
+        # rasterization and chunked agg paths keep memory bounded; together
+        # with a modest DPI this trims per-frame draw cost without touching
+        # the data. rc_context keeps the overrides local to this animation
+        with plt.rc_context({'path.simplify': True,
+                             'path.simplify_threshold': 1.0,
+                             'agg.path.chunksize': 10000}):
+            fig = plt.figure(figsize=(14, 10))
+            fig.set_dpi(80)
+            ax = fig.add_subplot(111, projection='3d')
         
-        # Store initial number of collections (conflicts + waypoint paths)
-        initial_collections = len(ax.collections)
+            if not self.system.primary_mission:
+                ax.text(0.5, 0.5, 0.5, 'No primary mission loaded', transform=ax.transAxes)
+                plt.show()
+                return
         
-        def animate_frame(frame):
-            current_time = times[frame % len(times)]
-            
-            # Remove old drone positions (keep initial collections)
-            while len(ax.collections) > initial_collections:
-                ax.collections[-1].remove()
-            
-            # Update primary drone position
-            primary_pos = self.system._interpolate_position(self.system.primary_mission, current_time)
-            if primary_pos:
-                ax.scatter([primary_pos.x], [primary_pos.y], [primary_pos.z], 
-                          c='blue', s=200, marker='o', alpha=0.9, edgecolors='darkblue')
-            
-            # Update simulated drone positions
+            # Plot static waypoint paths first from the cached SoA arrays
+            primary_xyz = self.system.primary_mission._xyz
+            ax.plot(primary_xyz[:, 0], primary_xyz[:, 1], primary_xyz[:, 2],
+                    'b-o', linewidth=2, markersize=8, label='Primary Mission', alpha=0.3)
+
+            # Plot simulated flight paths
             for i, flight in enumerate(self.system.simulated_flights):
-                sim_pos = self.system._interpolate_position(flight, current_time)
-                if sim_pos:
-                    color = self.colors[i % len(self.colors)]
-                    ax.scatter([sim_pos.x], [sim_pos.y], [sim_pos.z], 
-                              c=color, s=150, marker='s', alpha=0.9, 
-                              edgecolors='black', linewidth=0.5)
-            
-            # Update title with current time
-            ax.set_title(f'Drone Mission Deconfliction - 3D Animation (t={current_time:.1f}s)')
-            
-            return ax.collections[initial_collections:]
+                flight_xyz = flight._xyz
+                style = self._line_styles[i % len(self._line_styles)]
+                ax.plot(flight_xyz[:, 0], flight_xyz[:, 1], flight_xyz[:, 2],
+                        style, linewidth=2, markersize=6,
+                        label=f'Simulated Flight {flight.drone_id}', alpha=0.3)
+
+            # Plot conflicts
+            if self.system.conflicts:
+                conflict_xyz = self.system._conflicts_xyz()
+                ax.scatter(conflict_xyz[:, 0], conflict_xyz[:, 1], conflict_xyz[:, 2],
+                           c='red', s=200, marker='x', linewidth=3, label='Conflicts')
         
-        anim = animation.FuncAnimation(fig, animate_frame, frames=len(times), 
-                                     interval=100, repeat=True, blit=False)
-        plt.show()
-        return anim
\ No newline at end of file
+            # The title is static and only the small time readout changes per
+            # frame, so text layout work stays off the hot path
+            ax.set_xlabel('X Coordinate')
+            ax.set_ylabel('Y Coordinate')
+            ax.set_zlabel('Z Coordinate (Altitude)')
+            ax.set_title('Drone Mission Deconfliction - 3D Animation')
+            time_text = ax.text2D(0.02, 0.95, '', transform=ax.transAxes)
+            ax.legend()
+
+            # Persistent drone artists, created once and updated in place each
+            # frame: one for the primary and a single collection holding every
+            # simulated drone, so frame updates touch two artists total
+            primary_artist = ax.scatter([], [], [], c='blue', s=200, marker='o',
+                                        alpha=0.9, edgecolors='darkblue')
+
+            num_sim = len(self.system.simulated_flights)
+            sim_rgba = self._rgba[np.arange(num_sim) % len(self._rgba)]
+            sim_artist = ax.scatter(np.full(num_sim, np.nan), np.full(num_sim, np.nan),
+                                    np.full(num_sim, np.nan), c=sim_rgba, s=150,
+                                    marker='s', alpha=0.9, edgecolors='black', linewidth=0.5)
+
+            # Freeze the axes before the animation starts: the legend is
+            # already built once above, and with autoscale off matplotlib
+            # stops re-running limit calculations on every draw, which
+            # blitting needs for a stable cached background anyway
+            all_xyz = np.concatenate([primary_xyz] +
+                                     [f._xyz for f in self.system.simulated_flights])
+            if len(all_xyz):
+                lo, hi = all_xyz.min(axis=0), all_xyz.max(axis=0)
+                pad = 0.05 * (hi - lo + 1.0)
+                ax.set_autoscale_on(False)
+                ax.set_xlim(lo[0] - pad[0], hi[0] + pad[0])
+                ax.set_ylim(lo[1] - pad[1], hi[1] + pad[1])
+                ax.set_zlim(lo[2] - pad[2], hi[2] + pad[2])
+
+            # Sample the animation at the display frame rate instead of the
+            # conflict-check resolution: with a 100ms frame interval there is
+            # no point preparing 10x more frames than will ever be drawn
+            interval = 100  # ms per frame
+            fps = 1000.0 / interval
+            start_time = self.system.primary_mission.start_time
+            end_time = self.system.primary_mission.end_time
+            times = np.linspace(start_time, end_time,
+                                max(2, int(round((end_time - start_time) * fps)) + 1))
+
+            # Precompute every flight's full trajectory once so each frame is
+            # an array lookup, not per-drone interpolation calls. Inactive
+            # drones get NaN positions, which scatter simply skips
+            primary_positions = self.system._interpolate_trajectory(self.system.primary_mission, times)
+            # float32 to match the trajectory arrays; half the memory the
+            # frame lookups walk, and already C-contiguous from np.full
+            sim_xyz = np.full((num_sim, len(times), 3), np.nan, dtype=np.float32)
+            for i, flight in enumerate(self.system.simulated_flights):
+                traj = self.system._interpolate_trajectory(flight, times)
+                active = (times >= flight.start_time) & (times <= flight.end_time)
+                sim_xyz[i, active] = traj[active]
+
+            # Frame-major layout so each frame hands _offsets3d three
+            # contiguous per-axis rows rather than strided column views or
+            # freshly built Python lists
+            sim_by_t = np.ascontiguousarray(sim_xyz.transpose(1, 2, 0))
+
+            # Schedule only frames where at least one drone is airborne. The
+            # grid spans the primary window so its frames always qualify, but
+            # flights shorter than the window contribute nothing outside their
+            # own spans and an all-NaN lead-in or tail is skipped outright
+            active = (times >= start_time) & (times <= end_time)
+            for flight in self.system.simulated_flights:
+                active |= (times >= flight.start_time) & (times <= flight.end_time)
+            frame_indices = np.flatnonzero(active)
+
+            def animate_frame(frame):
+                # frames= already yields valid indices (and FuncAnimation
+                # restarts the sequence on repeat), so index directly
+                current_time = times[frame]
+
+                # Update primary drone position; length-1 slices keep the
+                # coordinates as contiguous ndarray views
+                pos = primary_positions[frame]
+                primary_artist._offsets3d = (pos[0:1], pos[1:2], pos[2:3])
+
+                # Update all simulated drone positions through the one collection
+                xyz = sim_by_t[frame]
+                sim_artist._offsets3d = (xyz[0], xyz[1], xyz[2])
+
+                # Update the time readout
+                time_text.set_text(f't={current_time:.1f}s')
+
+                return [primary_artist, sim_artist, time_text]
+
+            anim = animation.FuncAnimation(fig, animate_frame, frames=frame_indices,
+                                         interval=interval, repeat=True, blit=True)
+            plt.show()
+            return anim
\ No newline at end of file